@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import logging
+import time
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN, PLATFORMS
+from .api import async_migrate_entry_token_store, async_release_account_client
+from .const import DOMAIN, PLATFORMS, UNLOAD_TIMEOUT_SECONDS
 from .coordinator import VeluxKixDataUpdateCoordinator
 
+_LOGGER = logging.getLogger(__name__)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
@@ -13,17 +20,45 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator = VeluxKixDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await async_migrate_entry_token_store(hass, entry.entry_id, coordinator.api)
+        # Before any entity is added: excluded homes / climate sensors must already be disabled
+        coordinator.async_sync_registry_entries()
+        await coordinator.async_config_entry_first_refresh()
+    except BaseException:
+        await coordinator.async_shutdown()
+        await async_release_account_client(hass, coordinator.api)
+        raise
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, coordinator.async_invalidate_registry_homes)
+    )
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    started = time.monotonic()
+    # One budget for every wait below, so the whole unload stays within the bound
+    deadline = started + UNLOAD_TIMEOUT_SECONDS
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator: VeluxKixDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Cancel the in-flight refresh and (if this was the last user) the shared client's requests
+        await coordinator.async_shutdown(max(0.0, deadline - time.monotonic()))
+        await async_release_account_client(hass, coordinator.api, max(0.0, deadline - time.monotonic()))
+
+    elapsed = time.monotonic() - started
+    if elapsed > UNLOAD_TIMEOUT_SECONDS:
+        _LOGGER.warning("Unloading %s took %.2fs (bound %ss)", entry.title, elapsed, UNLOAD_TIMEOUT_SECONDS)
+    else:
+        _LOGGER.debug("Unloaded %s in %.2fs", entry.title, elapsed)
     return unload_ok
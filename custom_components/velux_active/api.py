@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import hmac
+import json
 import time
+from collections.abc import Awaitable, Callable, Mapping
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 from aiohttp import ClientError, ClientResponse
@@ -9,7 +14,87 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, STORAGE_VERSION
+from .const import (
+    BACKFILL_BATCH_LIMIT,
+    DATA_ACCOUNT_CLIENTS,
+    DOMAIN,
+    HOMESDATA_CACHE_TTL_SECONDS,
+    STORAGE_VERSION,
+    UNLOAD_TIMEOUT_SECONDS,
+)
+
+
+class VeluxKixApiError(RuntimeError):
+    """Error response from the Velux cloud, with the parsed HTTP status and cloud error code."""
+
+    def __init__(self, message: str, status: int | None = None, code: int | str | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+class VeluxKixAuthError(VeluxKixApiError):
+    """Credentials or token rejected."""
+
+
+class VeluxKixRateLimitError(VeluxKixApiError):
+    """The cloud is throttling us; retry_after is the requested pause in seconds, if given."""
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        code: int | str | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(message, status, code)
+        self.retry_after = retry_after
+
+
+# Netatmo-style numeric error codes used by the Velux cloud
+_AUTH_ERROR_CODES = {2, 3, 13}  # invalid token, expired token, application deactivated
+_RATE_LIMIT_ERROR_CODES = {26}  # user usage reached
+_AUTH_ERROR_NAMES = {"invalid_grant", "invalid_client", "invalid_token", "unauthorized_client"}
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_from_response(
+    url: str,
+    status: int,
+    headers: Mapping[str, str],
+    payload: Any,
+    text: str,
+) -> VeluxKixApiError:
+    code: int | str | None = None
+    message = text[:200]
+    error = payload.get("error") if isinstance(payload, dict) else None
+    if isinstance(error, dict):
+        code = error.get("code")
+        message = str(error.get("message") or message)
+    elif isinstance(error, str):
+        # OAuth2 style: {"error": "invalid_grant", "error_description": "..."}
+        code = error
+        message = str(payload.get("error_description") or error)
+
+    full = f"HTTP {status} for {url}: {message}"
+    if status == 429 or code in _RATE_LIMIT_ERROR_CODES:
+        return VeluxKixRateLimitError(full, status, code, _parse_retry_after(headers.get("Retry-After")))
+    if status in (401, 403) or code in _AUTH_ERROR_CODES or code in _AUTH_ERROR_NAMES:
+        return VeluxKixAuthError(full, status, code)
+    return VeluxKixApiError(full, status, code)
 
 
 class VeluxKixApiClient:
@@ -18,6 +103,7 @@ class VeluxKixApiClient:
     TOKEN_URL = "https://app.velux-active.com/oauth2/token"
     HOMESDATA_URL = "https://app.velux-active.com/api/homesdata"
     HOMESTATUS_URL = "https://app.velux-active.com/api/homestatus"
+    ROOMMEASURE_URL = "https://app.velux-active.com/api/getroommeasure"
 
     # Values copied from your Ruby script
     CLIENT_ID = "5931426da127d981e76bdd3f"
@@ -29,7 +115,6 @@ class VeluxKixApiClient:
         hass: HomeAssistant,
         account: str,
         password: str,
-        entry_id: str,
         token: dict[str, Any] | None = None,
         token_time: float | None = None,
     ) -> None:
@@ -37,11 +122,18 @@ class VeluxKixApiClient:
         self._session = async_get_clientsession(hass)
         self._account = account
         self._password = password
-        self._entry_id = entry_id
 
-        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.token")
+        # Token storage is keyed by account so every entry of the account shares it.
+        self.account_hash = account_key_hash(account)
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{self.account_hash}.token")
         self._token: dict[str, Any] | None = token
         self._token_time: float | None = token_time
+        self._token_lock = asyncio.Lock()
+
+        # Response cache and single-flight requests, shared by all users of this client.
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._inflight: dict[str, dict[str, Any]] = {}  # key -> {"task", "waiters"}
+        self._closed = False
 
         self.last_http_status: int | None = None
 
@@ -52,11 +144,25 @@ class VeluxKixApiClient:
         self._token = data.get("token")
         self._token_time = data.get("token_time")
 
+    async def async_adopt_token(self, token: dict[str, Any] | None, token_time: float | None) -> None:
+        """Use a token from elsewhere if it is newer than the one we have."""
+        if not token or token_time is None:
+            return
+        async with self._token_lock:
+            if self._token_time is not None and float(token_time) <= float(self._token_time):
+                return
+            self._token = token
+            self._token_time = float(token_time)
+            await self.async_save_token()
+
     async def async_save_token(self) -> None:
         if self._token is None or self._token_time is None:
             return
         await self._store.async_save({"token": self._token, "token_time": self._token_time})
 
+    def has_password(self, password: str) -> bool:
+        return hmac.compare_digest(self._password.encode(), password.encode())
+
     @property
     def token(self) -> dict[str, Any] | None:
         return self._token
@@ -73,21 +179,29 @@ class VeluxKixApiClient:
         return expires_in - age
 
     async def _post_form(self, url: str, data: dict[str, Any], timeout: float) -> dict[str, Any]:
+        if self._closed:
+            raise VeluxKixApiError(f"Client closed, not calling {url}")
         try:
             async with asyncio.timeout(timeout):
                 resp: ClientResponse
                 resp = await self._session.post(url, data=data)
                 self.last_http_status = resp.status
                 text = await resp.text()
-                if resp.status != 200:
-                    raise RuntimeError(f"HTTP {resp.status} for {url}: {text[:200]}")
-                return await resp.json(content_type=None)
+                try:
+                    payload = json.loads(text) if text else {}
+                except ValueError:
+                    payload = None
+                if resp.status != 200 or (isinstance(payload, dict) and "error" in payload):
+                    raise _error_from_response(url, resp.status, resp.headers, payload, text)
+                if not isinstance(payload, dict):
+                    raise VeluxKixApiError(f"Invalid JSON from {url}: {text[:200]}", resp.status)
+                return payload
         except TimeoutError as err:
             self.last_http_status = None
-            raise RuntimeError(f"Timeout calling {url}") from err
+            raise VeluxKixApiError(f"Timeout calling {url}") from err
         except ClientError as err:
             self.last_http_status = None
-            raise RuntimeError(f"Network error calling {url}: {err}") from err
+            raise VeluxKixApiError(f"Network error calling {url}: {err}") from err
 
     async def async_login_password_grant(self) -> None:
         payload = {
@@ -118,6 +232,11 @@ class VeluxKixApiClient:
         await self.async_save_token()
 
     async def async_ensure_token(self, forcerefresh: bool = False) -> None:
+        # Serialize so entries sharing this client never log in / refresh twice.
+        async with self._token_lock:
+            await self._async_ensure_token_locked(forcerefresh)
+
+    async def _async_ensure_token_locked(self, forcerefresh: bool) -> None:
         if self._token is None:
             await self.async_load_token()
 
@@ -130,24 +249,180 @@ class VeluxKixApiClient:
         if forcerefresh or (remaining is not None and remaining < 600):
             try:
                 await self.async_refresh_token()
+            except VeluxKixRateLimitError:
+                # A password login now would only deepen the throttling
+                raise
             except Exception:
                 # If refresh fails (invalid/expired refresh token), do password login again
                 await self.async_login_password_grant()
 
+    async def _async_cached(
+        self,
+        key: str,
+        ttl: float,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        cached = self._cache.get(key)
+        if cached is not None and (time.monotonic() - cached[0]) < ttl:
+            return cached[1]
+
+        # Coalesce concurrent callers onto one request. It is shielded from a single caller
+        # being cancelled, but cancelled once the last caller has given up (e.g. its deadline fired).
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = {"task": asyncio.create_task(self._async_fetch_into_cache(key, fetch)), "waiters": 0}
+            self._inflight[key] = inflight
+            inflight["task"].add_done_callback(lambda _t, k=key, i=inflight: self._forget_inflight(k, i))
+        inflight["waiters"] += 1
+        try:
+            return await asyncio.shield(inflight["task"])
+        finally:
+            inflight["waiters"] -= 1
+            if inflight["waiters"] == 0 and not inflight["task"].done():
+                self._forget_inflight(key, inflight)
+                inflight["task"].cancel()
+
+    def _forget_inflight(self, key: str, inflight: dict[str, Any]) -> None:
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+
+    async def _async_fetch_into_cache(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        result = await fetch()
+        self._cache[key] = (time.monotonic(), result)
+        return result
+
+    async def async_close(self, timeout: float = UNLOAD_TIMEOUT_SECONDS) -> None:
+        """Cancel in-flight requests and refuse new ones; waits at most `timeout` seconds."""
+        self._closed = True
+        self._cache.clear()
+        tasks = [inflight["task"] for inflight in self._inflight.values() if not inflight["task"].done()]
+        for task in tasks:
+            task.cancel()
+        if tasks and timeout > 0:
+            await asyncio.wait(tasks, timeout=timeout)
+
     async def async_get_homesdata(self) -> dict[str, Any]:
         if not self._token:
             raise RuntimeError("Missing token")
-        return await self._post_form(
-            self.HOMESDATA_URL,
-            {"access_token": self._token.get("access_token")},
-            timeout=8.0,
+        return await self._async_cached(
+            "homesdata",
+            HOMESDATA_CACHE_TTL_SECONDS,
+            lambda: self._post_form(
+                self.HOMESDATA_URL,
+                {"access_token": self._token.get("access_token")},
+                timeout=8.0,
+            ),
         )
 
     async def async_get_homestatus(self, home_id: str) -> dict[str, Any]:
         if not self._token:
             raise RuntimeError("Missing token")
+        # Not cached: every poll wants fresh readings, and a cancelled poll cancels its request
         return await self._post_form(
             self.HOMESTATUS_URL,
             {"access_token": self._token.get("access_token"), "home_id": str(home_id)},
             timeout=8.0,
         )
+
+    async def async_get_room_measure(
+        self,
+        home_id: str,
+        room_id: str,
+        measure_type: str,
+        date_begin: int,
+        date_end: int,
+        scale: str = "1hour",
+        limit: int = BACKFILL_BATCH_LIMIT,
+    ) -> dict[str, Any]:
+        """Historical room measurements (not cached; used for backfilling statistics)."""
+        if not self._token:
+            raise RuntimeError("Missing token")
+        return await self._post_form(
+            self.ROOMMEASURE_URL,
+            {
+                "access_token": self._token.get("access_token"),
+                "home_id": str(home_id),
+                "room_id": str(room_id),
+                "type": measure_type,
+                "scale": scale,
+                "date_begin": str(int(date_begin)),
+                "date_end": str(int(date_end)),
+                "limit": str(limit),
+                "optimize": "false",
+                "real_time": "true",
+            },
+            timeout=20.0,
+        )
+
+
+def coerce_timestamp(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, str) and value.strip() == "":
+        return None
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Heuristic: treat large values as milliseconds
+    if ts >= 1_000_000_000_000:
+        ts = ts / 1000.0
+    return ts
+
+
+def account_key_hash(account: str) -> str:
+    """Stable, non-reversible key for an account (used in storage keys)."""
+    return hashlib.sha256(account.strip().lower().encode()).hexdigest()[:16]
+
+
+async def async_migrate_entry_token_store(hass: HomeAssistant, entry_id: str, client: VeluxKixApiClient) -> None:
+    """Move a token from the old per-entry store (`velux_active.<entry_id>.token`) to the account store."""
+    legacy = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.token")
+    data = await legacy.async_load()
+    if not data:
+        return
+    await client.async_adopt_token(data.get("token"), data.get("token_time"))
+    await legacy.async_remove()
+
+
+def acquire_account_client(
+    hass: HomeAssistant,
+    account: str,
+    password: str,
+    token: dict[str, Any] | None = None,
+    token_time: float | None = None,
+) -> VeluxKixApiClient:
+    """Return the shared client for these credentials, creating it on first use."""
+    # account hash -> [{"client", "refs"}]; the password is only compared, never used as a key
+    clients: dict[str, list[dict[str, Any]]] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_ACCOUNT_CLIENTS, {}
+    )
+    refs = clients.setdefault(account_key_hash(account), [])
+    ref = next((ref for ref in refs if ref["client"].has_password(password)), None)
+    if ref is None:
+        ref = {"client": VeluxKixApiClient(hass, account, password, token=token, token_time=token_time), "refs": 0}
+        refs.append(ref)
+    ref["refs"] += 1
+    return ref["client"]
+
+
+async def async_release_account_client(
+    hass: HomeAssistant, client: VeluxKixApiClient, timeout: float = UNLOAD_TIMEOUT_SECONDS
+) -> None:
+    """Drop one reference to a shared client; close and forget it once nobody uses it."""
+    clients: dict[str, list[dict[str, Any]]] = hass.data.get(DOMAIN, {}).get(DATA_ACCOUNT_CLIENTS, {})
+    refs = clients.get(client.account_hash, [])
+    for ref in refs:
+        if ref["client"] is not client:
+            continue
+        ref["refs"] -= 1
+        if ref["refs"] <= 0:
+            refs.remove(ref)
+            if not refs:
+                clients.pop(client.account_hash, None)
+            await client.async_close(timeout)
+        return
@@ -5,12 +5,11 @@ from typing import Any
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .coordinator import VeluxKixDataUpdateCoordinator
-from .entity_helpers import VeluxKixBaseEntity, module_device_info, room_device_info
+from .entity_helpers import VeluxKixBaseEntity, api_device_info, module_device_info, room_device_info
 
 
 async def async_setup_entry(
@@ -73,12 +72,7 @@ class VeluxKixApiOkBinarySensor(VeluxKixBaseEntity, BinarySensorEntity):
     _attr_unique_id = f"{DOMAIN}_api_ok"
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
     _attr_icon = "mdi:cloud-check"
-    _attr_device_info = DeviceInfo(
-        identifiers={(DOMAIN, "api")},
-        name="Velux API",
-        manufacturer="Velux",
-        model="Cloud API",
-    )
+    _attr_device_info = api_device_info()
 
     @property
     def is_on(self) -> bool | None:
@@ -88,7 +82,14 @@ class VeluxKixApiOkBinarySensor(VeluxKixBaseEntity, BinarySensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        return {"last_http_status": self.coordinator.last_http_status}
+        return {
+            "last_http_status": self.coordinator.last_http_status,
+            "last_refresh_duration": self.coordinator.last_refresh_duration,
+            "deadline_cut_homes": list(self.coordinator.deadline_cut_homes),
+            "failed_homes": dict(self.coordinator.home_errors),
+            "pruned_homes": list(self.coordinator.pruned_homes),
+            "stale_items": len(self.coordinator.stale_items),
+        }
 
 
 class VeluxKixModuleReachableBinarySensor(VeluxKixBaseEntity, BinarySensorEntity):
@@ -3,11 +3,28 @@ from __future__ import annotations
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 
 from .api import VeluxKixApiClient
-from .const import DOMAIN, CONF_ACCOUNT, CONF_PASSWORD, CONF_TOKEN, CONF_TOKEN_TIME
+from .const import (
+    DOMAIN,
+    CONF_ACCOUNT,
+    CONF_EXCLUDE_CLIMATE_HISTORY,
+    CONF_EXCLUDED_HOMES,
+    CONF_FAIL_UNAVAILABLE_AFTER_MINUTES,
+    CONF_HOMES,
+    CONF_IMPORT_STATISTICS,
+    CONF_MODULE_STALE_AFTER_MINUTES,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_TOKEN_TIME,
+    DEFAULT_EXCLUDE_CLIMATE_HISTORY,
+    DEFAULT_FAIL_UNAVAILABLE_AFTER_MINUTES,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MODULE_STALE_AFTER_MINUTES,
+)
 
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
@@ -21,6 +38,11 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 class VeluxKixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> VeluxKixOptionsFlow:
+        return VeluxKixOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
         errors: dict[str, str] = {}
 
@@ -28,17 +50,17 @@ class VeluxKixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             account = user_input[CONF_ACCOUNT].strip()
             password = user_input[CONF_PASSWORD]
 
+            # Use account as unique id to avoid duplicates; checked before logging in
+            await self.async_set_unique_id(f"{DOMAIN}:{account.lower()}")
+            self._abort_if_unique_id_configured()
+
             # Validate by attempting a login
-            api = VeluxKixApiClient(self.hass, account, password, entry_id="__flow__")
+            api = VeluxKixApiClient(self.hass, account, password)
             try:
                 await api.async_login_password_grant()
             except Exception:
                 errors["base"] = "auth"
             else:
-                # Use account as unique id to avoid duplicates
-                await self.async_set_unique_id(f"{DOMAIN}:{account.lower()}")
-                self._abort_if_unique_id_configured()
-
                 return self.async_create_entry(
                     title=f"Velux Active KIX 300 ({account})",
                     data={
@@ -54,3 +76,64 @@ class VeluxKixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class VeluxKixOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        # Kept under our own name: OptionsFlow.config_entry is only populated from HA 2024.11 on,
+        # and assigning it ourselves is deprecated there.
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        errors: dict[str, str] = {}
+        options = self._entry.options
+        homes = self._known_homes()
+
+        if user_input is not None:
+            data = dict(user_input)
+            excluded = list(options.get(CONF_EXCLUDED_HOMES, []))
+            if CONF_HOMES in data:
+                selected = data.pop(CONF_HOMES)
+                if not selected:
+                    errors[CONF_HOMES] = "no_homes"
+                # Store what was deselected; homes added to the account later stay polled
+                excluded = [home_id for home_id in homes if home_id not in selected]
+            if not errors:
+                return self.async_create_entry(title="", data={**data, CONF_EXCLUDED_HOMES: excluded})
+
+        fields: dict = {}
+        if homes:
+            # Only offered while the homes are known (entry loaded); otherwise the selection is kept
+            excluded = options.get(CONF_EXCLUDED_HOMES, [])
+            fields[
+                vol.Required(CONF_HOMES, default=[home_id for home_id in homes if home_id not in excluded])
+            ] = cv.multi_select(homes)
+        schema = vol.Schema(
+            {
+                **fields,
+                vol.Required(
+                    CONF_IMPORT_STATISTICS,
+                    default=options.get(CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS),
+                ): bool,
+                vol.Required(
+                    CONF_EXCLUDE_CLIMATE_HISTORY,
+                    default=options.get(CONF_EXCLUDE_CLIMATE_HISTORY, DEFAULT_EXCLUDE_CLIMATE_HISTORY),
+                ): bool,
+                vol.Required(
+                    CONF_FAIL_UNAVAILABLE_AFTER_MINUTES,
+                    default=options.get(CONF_FAIL_UNAVAILABLE_AFTER_MINUTES, DEFAULT_FAIL_UNAVAILABLE_AFTER_MINUTES),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=24 * 60)),
+                vol.Required(
+                    CONF_MODULE_STALE_AFTER_MINUTES,
+                    default=options.get(CONF_MODULE_STALE_AFTER_MINUTES, DEFAULT_MODULE_STALE_AFTER_MINUTES),
+                ): vol.All(vol.Coerce(int), vol.Range(min=15, max=7 * 24 * 60)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+
+    def _known_homes(self) -> dict[str, str]:
+        """home_id -> name of every home of the account, as seen by the running coordinator."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id)
+        if coordinator is None:
+            return {}
+        return dict(coordinator.known_homes)
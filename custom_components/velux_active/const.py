@@ -13,3 +13,59 @@ FAIL_UNAVAILABLE_AFTER_SECONDS = 60 * 60  # 1 hour
 
 # Default polling interval (seconds)
 DEFAULT_UPDATE_INTERVAL_SECONDS = 300
+
+# hass.data[DOMAIN] key holding the shared, reference-counted API clients per account
+DATA_ACCOUNT_CLIENTS = "account_clients"
+
+# Shared homesdata (topology) cache lifetime in seconds; homestatus is never cached
+HOMESDATA_CACHE_TTL_SECONDS = 15 * 60
+
+# Overall time budget for one refresh (token + homesdata + all homestatus calls), in seconds.
+# Requests share the remaining time; whatever cannot fit is skipped until the next poll.
+REFRESH_DEADLINE_SECONDS = 30
+# Never start a request with less time than this left
+MIN_REQUEST_BUDGET_SECONDS = 1.0
+# Reserved (not fair-shared) for the token step: a login may need its full time, and usually
+# no request is made at all. Homes that no longer fit are skipped rather than the token renewal.
+TOKEN_BUDGET_SECONDS = 20.0
+
+# Adaptive polling under cloud throttling: back off by this factor per throttled refresh
+# (honouring Retry-After), shrink again by the recovery factor per clean refresh.
+MAX_UPDATE_INTERVAL_SECONDS = 60 * 60
+THROTTLE_BACKOFF_FACTOR = 2.0
+THROTTLE_RECOVERY_FACTOR = 0.75
+
+# Options
+CONF_IMPORT_STATISTICS = "import_statistics"
+CONF_EXCLUDE_CLIMATE_HISTORY = "exclude_climate_history"
+DEFAULT_IMPORT_STATISTICS = False
+DEFAULT_EXCLUDE_CLIMATE_HISTORY = False
+
+# Phase-locked polling: learn each module's reporting period from successive last_seen values
+# and time the next poll just after an expected report, within +/- the window of the interval.
+CADENCE_MIN_SAMPLES = 3
+CADENCE_MAX_SAMPLES = 12
+CADENCE_MIN_PERIOD_SECONDS = 60
+CADENCE_MAX_PERIOD_SECONDS = 3 * 60 * 60
+CADENCE_GRACE_SECONDS = 20  # time for a device report to become visible in the cloud
+CADENCE_WINDOW = 0.25
+CONF_HOMES = "homes"  # options form field: homes to poll
+# Stored option: deselected home ids, so homes added to the account later are polled by default
+CONF_EXCLUDED_HOMES = "excluded_homes"
+CONF_FAIL_UNAVAILABLE_AFTER_MINUTES = "fail_unavailable_after_minutes"
+CONF_MODULE_STALE_AFTER_MINUTES = "module_stale_after_minutes"
+DEFAULT_FAIL_UNAVAILABLE_AFTER_MINUTES = FAIL_UNAVAILABLE_AFTER_SECONDS // 60
+# A module whose last_seen is older than this (or that is unreachable) is stale: its readings are frozen
+DEFAULT_MODULE_STALE_AFTER_MINUTES = 3 * 60
+
+# Upper bound for unloading an entry: in-flight refreshes and requests are cancelled, not awaited
+UNLOAD_TIMEOUT_SECONDS = 5.0
+
+# Backfill of hourly statistics after downtime (requires statistics import)
+BACKFILL_MIN_GAP_SECONDS = 2 * 60 * 60  # shorter polling gaps are covered by the live buffer (not after restarts)
+BACKFILL_MAX_WINDOW_SECONDS = 7 * 24 * 60 * 60
+BACKFILL_BATCH_LIMIT = 1024  # rows per getroommeasure request
+BACKFILL_MARK_SAVE_DELAY_SECONDS = 60
+
+# Room air_quality index (0 excellent .. 4 warning) from which a room counts as poor
+AIR_QUALITY_POOR_INDEX = 3
@@ -1,69 +1,549 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import VeluxKixApiClient
+from .api import VeluxKixApiClient, VeluxKixRateLimitError, acquire_account_client, coerce_timestamp
 from .const import (
+    AIR_QUALITY_POOR_INDEX,
+    BACKFILL_MARK_SAVE_DELAY_SECONDS,
+    BACKFILL_MAX_WINDOW_SECONDS,
     CONF_ACCOUNT,
+    CONF_FAIL_UNAVAILABLE_AFTER_MINUTES,
+    CONF_EXCLUDE_CLIMATE_HISTORY,
+    CONF_EXCLUDED_HOMES,
+    CONF_IMPORT_STATISTICS,
+    CONF_MODULE_STALE_AFTER_MINUTES,
     CONF_PASSWORD,
     CONF_TOKEN,
     CONF_TOKEN_TIME,
+    DEFAULT_EXCLUDE_CLIMATE_HISTORY,
+    DEFAULT_FAIL_UNAVAILABLE_AFTER_MINUTES,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MODULE_STALE_AFTER_MINUTES,
     DEFAULT_UPDATE_INTERVAL_SECONDS,
     DOMAIN,
+    MIN_REQUEST_BUDGET_SECONDS,
+    REFRESH_DEADLINE_SECONDS,
+    STORAGE_VERSION,
+    TOKEN_BUDGET_SECONDS,
+    UNLOAD_TIMEOUT_SECONDS,
 )
+from .polling import AdaptivePollInterval, ReportCadenceTracker
+from .statistics import STATISTIC_KEYS, HourlyStatisticsBuffer, async_backfill_home, backfill_window
+
+
+def registry_home_id(unique_id: str) -> str | None:
+    """Home id of an entity unique id (velux_active_<home_id>_<room|module|gateway|home>_...)."""
+    prefix = f"{DOMAIN}_"
+    if not unique_id.startswith(prefix):
+        return None
+    home_id, sep, _rest = unique_id[len(prefix):].partition("_")
+    return home_id if sep else None
 
 
 class VeluxKixDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.entry = entry
-        self.api = VeluxKixApiClient(
+        # Shared with every other entry using the same credentials (released on unload).
+        self.api: VeluxKixApiClient = acquire_account_client(
             hass,
             entry.data[CONF_ACCOUNT],
             entry.data[CONF_PASSWORD],
-            entry.entry_id,
             token=entry.data.get(CONF_TOKEN),
             token_time=entry.data.get(CONF_TOKEN_TIME),
         )
 
         self.last_success_ts: float | None = None
         self.last_http_status: int | None = None  # last request overall
+        # Homes whose homestatus did not fit into the last refresh deadline
+        self.deadline_cut_homes: list[str] = []
+        self.last_refresh_duration: float | None = None
+        # Per-home freshness: last successful homestatus and last error of each home
+        self.home_last_success_ts: dict[str, float] = {}
+        self.home_errors: dict[str, str] = {}
+        self.poll_interval = AdaptivePollInterval(DEFAULT_UPDATE_INTERVAL_SECONDS)
+        self.last_rate_limit: str | None = None
+        self.cadence = ReportCadenceTracker()
+        # Homes not fetched because they are deselected or have no enabled entities
+        self.pruned_homes: list[str] = []
+        # Every home of the account (id -> name), fetched or not; used for home selection
+        self.known_homes: dict[str, str] = {}
+        # home_id -> has at least one enabled entity; rebuilt after entity registry changes
+        self._registry_homes: dict[str, bool] | None = None
+
+        # Availability index, rebuilt once per refresh so entities can look it up in O(1)
+        self.fail_unavailable_after = 60 * entry.options.get(
+            CONF_FAIL_UNAVAILABLE_AFTER_MINUTES, DEFAULT_FAIL_UNAVAILABLE_AFTER_MINUTES
+        )
+        self.module_stale_after = 60 * entry.options.get(
+            CONF_MODULE_STALE_AFTER_MINUTES, DEFAULT_MODULE_STALE_AFTER_MINUTES
+        )
+        self.api_available = False
+        self.available_homes: set[str] = set()
+        self.stale_items: set[tuple[str, str, str]] = set()  # (home_id, "module" | "room", id)
+        # Home-wide climate aggregates, rebuilt once per refresh: home_id -> key -> {"value", "room", "rooms"}
+        self.home_aggregates: dict[str, dict[str, dict[str, Any]]] = {}
+
+        # The fetch task currently running, so unload can cancel it instead of waiting for the cloud
+        self._refresh_task: asyncio.Task[Any] | None = None
+        # Background work started by refreshes (history backfills); cancelled on unload
+        self._background_tasks: set[asyncio.Task[Any]] = set()
+
+        # Statistics backfill: per home, the time up to which statistics are covered by live polls
+        self._backfill_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.backfill")
+        self._backfill_marks: dict[str, float] | None = None
+        # Per home, windows [begin, end) still to be backfilled (queued, or failed and retried)
+        self._backfill_gaps: dict[str, list[list[float]]] = {}
+        self._backfilling: set[str] = set()
+        # Homes whose readings went into the live hourly buffer since this entry was loaded
+        self._live_sampled: set[str] = set()
+        # Hourly long-term statistics of room readings (only when enabled in the options)
+        self.statistics: HourlyStatisticsBuffer | None = None
+        if entry.options.get(CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS):
+            self.statistics = HourlyStatisticsBuffer()
+        # Room climate sensors exist unless their readings are kept as statistics only
+        self.climate_entities = self.statistics is None or not entry.options.get(
+            CONF_EXCLUDE_CLIMATE_HISTORY, DEFAULT_EXCLUDE_CLIMATE_HISTORY
+        )
 
         super().__init__(
             hass,
             logger=__import__("logging").getLogger(__name__),
             name=f"{DOMAIN}_{entry.entry_id}",
-            update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL_SECONDS),
+            update_interval=timedelta(seconds=self.poll_interval.interval),
+        )
+
+    @callback
+    def async_invalidate_registry_homes(self, event: Event | None = None) -> None:
+        self._registry_homes = None
+
+    def _registry_home_state(self) -> dict[str, bool]:
+        if self._registry_homes is None:
+            registry = er.async_get(self.hass)
+            homes: dict[str, bool] = {}
+            for reg_entry in er.async_entries_for_config_entry(registry, self.entry.entry_id):
+                home_id = registry_home_id(reg_entry.unique_id)
+                if home_id is None:
+                    continue
+                homes[home_id] = homes.get(home_id, False) or reg_entry.disabled_by is None
+            self._registry_homes = homes
+        return self._registry_homes
+
+    @callback
+    def async_sync_registry_entries(self) -> None:
+        """Disable entities and devices the options exclude; re-enable the ones no longer excluded.
+
+        Excluded are all entries of deselected homes and, while readings are kept as statistics
+        only, the room climate sensors. Disabled entities are not added, so the recorder stores
+        nothing for them, and their entity ids, areas and customisations are kept. Only entries
+        disabled by the integration are re-enabled; the user's own choices stay.
+        """
+        excluded = set(self.entry.options.get(CONF_EXCLUDED_HOMES, []))
+        entity_registry = er.async_get(self.hass)
+        for reg_entry in er.async_entries_for_config_entry(entity_registry, self.entry.entry_id):
+            home_id = registry_home_id(reg_entry.unique_id)
+            if home_id is None:
+                continue
+            uid = reg_entry.unique_id
+            disable = home_id in excluded or (
+                not self.climate_entities
+                and reg_entry.domain == "sensor"
+                and "_room_" in uid
+                and uid.rsplit("_", 1)[-1] in STATISTIC_KEYS
+            )
+            if disable and reg_entry.disabled_by is None:
+                entity_registry.async_update_entity(
+                    reg_entry.entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+                )
+            elif not disable and reg_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+                entity_registry.async_update_entity(reg_entry.entity_id, disabled_by=None)
+
+        device_registry = dr.async_get(self.hass)
+        for device in dr.async_entries_for_config_entry(device_registry, self.entry.entry_id):
+            # Home devices are identified by <home_id>_<room|module|gateway>_<id>
+            home_ids = [ident.split("_", 1)[0] for domain, ident in device.identifiers if domain == DOMAIN and "_" in ident]
+            if not home_ids:
+                continue
+            if home_ids[0] in excluded and device.disabled_by is None:
+                device_registry.async_update_device(device.id, disabled_by=dr.DeviceEntryDisabler.INTEGRATION)
+            elif home_ids[0] not in excluded and device.disabled_by is dr.DeviceEntryDisabler.INTEGRATION:
+                device_registry.async_update_device(device.id, disabled_by=None)
+
+    def _should_fetch_home(self, home_id: str) -> bool:
+        if home_id in self.entry.options.get(CONF_EXCLUDED_HOMES, []):
+            return False
+        if self.statistics is not None:
+            # Statistics are imported regardless of which entities are enabled
+            return True
+        # Homes without any registered entity are new: fetch them so entities get created
+        return self._registry_home_state().get(home_id, True)
+
+    def _schedule_next_poll(self) -> None:
+        """Set the delay to the next poll: the adaptive interval, phase-locked to device reports."""
+        delay = self.poll_interval.interval
+        if not self.poll_interval.throttled:
+            # Never pull polls earlier while the cloud is asking us to slow down
+            delay = self.cadence.next_poll_delay(time.time(), delay) or delay
+        interval = timedelta(seconds=round(delay))
+        if interval != self.update_interval:
+            self.logger.debug("Next poll in %ss (base interval %ss)", interval.total_seconds(), self.poll_interval.interval)
+            self.update_interval = interval
+
+    def _record_throttled(self, err: VeluxKixRateLimitError) -> None:
+        self.last_rate_limit = str(err)
+        self.poll_interval.record_throttled(err.retry_after)
+        self.logger.info("Rate limited by the Velux cloud, polling every %ss for now", self.poll_interval.interval)
+        self._schedule_next_poll()
+
+    def is_available(self, home_id: str, kind: str | None = None, item_id: str | None = None) -> bool:
+        if home_id not in self.available_homes:
+            return False
+        return kind is None or (home_id, kind, item_id) not in self.stale_items
+
+    def _rebuild_availability_index(self, data: dict[str, Any] | None) -> None:
+        """Judge the API, every home, and every module/room once, from timestamps and reachability.
+
+        A home is available while its last good status is younger than the failure window.
+        A module is stale when it is unreachable or its last_seen is older than the staleness
+        threshold; a room is stale when all of its sensor (non-position) modules are.
+        """
+        now = time.time()
+        self.api_available = (
+            self.last_success_ts is not None and (now - self.last_success_ts) <= self.fail_unavailable_after
         )
+        self.available_homes = {
+            home_id for home_id, ts in self.home_last_success_ts.items() if (now - ts) <= self.fail_unavailable_after
+        }
+
+        stale: set[tuple[str, str, str]] = set()
+        for home_id, h in ((data or {}).get("homes", {}) or {}).items():
+            stale_modules: set[str] = set()
+            sensor_modules: set[str] = set()  # modules without positions, i.e. what feeds room readings
+            for module in (h.get("status", {}) or {}).get("modules") or []:
+                if module.get("id") is None:
+                    continue
+                if "current_position" not in module and "target_position" not in module:
+                    sensor_modules.add(str(module.get("id")))
+                seen = coerce_timestamp(module.get("last_seen"))
+                if module.get("reachable") is False or (
+                    seen is not None and (now - seen) > self.module_stale_after
+                ):
+                    stale_modules.add(str(module.get("id")))
+                    stale.add((home_id, "module", str(module.get("id"))))
+            for room in (h.get("meta", {}) or {}).get("rooms") or []:
+                module_ids = {str(mid) for mid in (room.get("module_ids") or [])} & sensor_modules
+                if module_ids and module_ids <= stale_modules:
+                    stale.add((home_id, "room", str(room.get("id"))))
+        self.stale_items = stale
+
+    def _flush_statistics(self) -> None:
+        try:
+            rows = self.statistics.async_flush(self.hass, dt_util.utcnow())
+        except Exception as err:  # statistics must never break the refresh itself
+            self.logger.warning("Writing hourly statistics failed: %s", err)
+            return
+        if rows:
+            self.logger.debug("Queued %s hourly statistics rows for the recorder", rows)
+
+    @staticmethod
+    def _request_budget(deadline: float, outstanding: int) -> float | None:
+        """Fair share of the remaining refresh time for the next request, or None if exhausted."""
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_REQUEST_BUDGET_SECONDS:
+            return None
+        share = remaining / max(outstanding, 1)
+        return min(remaining, max(share, MIN_REQUEST_BUDGET_SECONDS))
+
+    def _required_budget(self, deadline: float, outstanding: int) -> float:
+        budget = self._request_budget(deadline, outstanding)
+        if budget is None:
+            raise TimeoutError
+        return budget
 
     async def _async_update_data(self) -> dict[str, Any]:
+        # Run the fetch in a task of our own: whoever called the refresh (setup, a service call,
+        # the debouncer) must not be cancelled by async_shutdown, only the fetch itself.
+        task = self.hass.async_create_background_task(self._async_fetch_data(), f"{self.name} refresh")
+        self._refresh_task = task
+        try:
+            data = await task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if task.cancelled() and (current is None or not current.cancelling()):
+                # Only our fetch was cancelled (unload), not the caller
+                self._rebuild_availability_index(self.data)
+                raise UpdateFailed("Refresh cancelled") from None
+            raise
+        except UpdateFailed:
+            self._rebuild_availability_index(self.data)
+            self._rebuild_home_aggregates(self.data)
+            raise
+        finally:
+            self._refresh_task = None
+        self._rebuild_availability_index(data)
+        self._rebuild_home_aggregates(data)
+        self.cadence.prune(set(data.get("homes", {})), self.stale_items)
+        return data
+
+    def _rebuild_home_aggregates(self, data: dict[str, Any] | None) -> None:
+        """One pass over each home's rooms: max CO2, min temperature, mean humidity, poor air rooms.
+
+        Stale rooms are left out so a dead sensor's frozen value cannot win an aggregate.
+        """
+        aggregates: dict[str, dict[str, dict[str, Any]]] = {}
+        for home_id, h in ((data or {}).get("homes", {}) or {}).items():
+            room_names = {
+                str(r.get("id")): r.get("name", str(r.get("id"))) for r in (h.get("meta", {}) or {}).get("rooms") or []
+            }
+            max_co2: tuple[float, str] | None = None
+            min_temperature: tuple[float, str] | None = None
+            humidity_sum = 0.0
+            humidity_rooms: list[str] = []
+            poor_rooms: list[str] = []
+            for room in (h.get("status", {}) or {}).get("rooms") or []:
+                if room.get("id") is None or (home_id, "room", str(room.get("id"))) in self.stale_items:
+                    continue
+                name = room_names.get(str(room.get("id")), str(room.get("id")))
+                try:
+                    co2 = float(room["co2"])
+                    if max_co2 is None or co2 > max_co2[0]:
+                        max_co2 = (co2, name)
+                except (KeyError, TypeError, ValueError):
+                    pass
+                try:
+                    # API reports tenths of a degree
+                    temperature = float(room["temperature"]) / 10.0
+                    if min_temperature is None or temperature < min_temperature[0]:
+                        min_temperature = (temperature, name)
+                except (KeyError, TypeError, ValueError):
+                    pass
+                try:
+                    humidity_sum += float(room["humidity"])
+                    humidity_rooms.append(name)
+                except (KeyError, TypeError, ValueError):
+                    pass
+                try:
+                    if int(room["air_quality"]) >= AIR_QUALITY_POOR_INDEX:
+                        poor_rooms.append(name)
+                except (KeyError, TypeError, ValueError):
+                    pass
+
+            aggregates[home_id] = {
+                "max_co2": {"value": max_co2[0] if max_co2 else None, "room": max_co2[1] if max_co2 else None},
+                "min_temperature": {
+                    "value": min_temperature[0] if min_temperature else None,
+                    "room": min_temperature[1] if min_temperature else None,
+                },
+                "mean_humidity": {
+                    "value": round(humidity_sum / len(humidity_rooms), 1) if humidity_rooms else None,
+                    "rooms": humidity_rooms,
+                },
+                "poor_air_quality_rooms": {"value": len(poor_rooms), "rooms": poor_rooms},
+            }
+        self.home_aggregates = aggregates
+
+    async def async_shutdown(self, timeout: float = UNLOAD_TIMEOUT_SECONDS) -> None:
+        """Stop scheduled polls and cancel a running refresh; waits at most `timeout` seconds for it."""
+        await super().async_shutdown()
+        tasks = {task for task in self._background_tasks if not task.done()}
+        task = self._refresh_task
+        if task is not None and not task.done():
+            tasks.add(task)
+        if tasks:
+            for task in tasks:
+                task.cancel()
+            pending = tasks
+            if timeout > 0:
+                _done, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                self.logger.warning(
+                    "%s task(s) did not stop within %.1fs after cancellation", len(pending), timeout
+                )
+        if self._backfill_marks is not None:
+            await self._backfill_store.async_save(self._backfill_data())
+
+    def _backfill_data(self) -> dict[str, Any]:
+        return {
+            "homes": dict(self._backfill_marks or {}),
+            "gaps": {home_id: [list(gap) for gap in gaps] for home_id, gaps in self._backfill_gaps.items() if gaps},
+        }
+
+    def _note_home_sampled(self, home_id: str, meta: dict[str, Any], status: dict[str, Any]) -> None:
+        """Advance the home's coverage mark; queue a backfill if live polling left a gap."""
+        now = time.time()
+        mark = self._backfill_marks.get(home_id)
+        window = None if mark is None else backfill_window(mark, now, home_id in self._live_sampled)
+        if window is not None:
+            self._backfill_gaps.setdefault(home_id, []).append(list(window))
+        # The mark only ever follows live polling; missed windows are tracked as gaps
+        self._backfill_marks[home_id] = now
+        self._live_sampled.add(home_id)
+        if self._backfill_gaps.get(home_id) and home_id not in self._backfilling:
+            self._backfilling.add(home_id)
+            task = self.hass.async_create_background_task(
+                self._async_backfill(home_id, meta, status),
+                f"{self.name} backfill {home_id}",
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        self._backfill_store.async_delay_save(self._backfill_data, BACKFILL_MARK_SAVE_DELAY_SECONDS)
+
+    async def _async_backfill(self, home_id: str, meta: dict[str, Any], status: dict[str, Any]) -> None:
+        """Backfill the home's pending gaps oldest first; a failed gap stays pending for the next sample."""
+        gaps = self._backfill_gaps[home_id]
         try:
-            await self.api.async_ensure_token()
-            homesdata = await self.api.async_get_homesdata()
+            while gaps:
+                begin, end = gaps[0]
+                begin = max(begin, time.time() - BACKFILL_MAX_WINDOW_SECONDS)
+                if begin < end:
+                    rows = await async_backfill_home(self.hass, self.api, home_id, meta, status, begin, end)
+                    self.logger.info(
+                        "Backfilled %s hourly statistics rows for home %s (%.1f h gap)",
+                        rows,
+                        home_id,
+                        (end - begin) / 3600,
+                    )
+                gaps.pop(0)
+                self._backfill_store.async_delay_save(self._backfill_data, BACKFILL_MARK_SAVE_DELAY_SECONDS)
+        except asyncio.CancelledError:
+            # Unloading: the gap is saved and retried after the next start
+            raise
+        except VeluxKixRateLimitError as err:
+            # Retried with the next sample the cloud serves us
+            self._record_throttled(err)
+        except Exception as err:
+            self.logger.warning("Backfilling statistics for home %s failed: %s", home_id, err)
+        finally:
+            self._backfilling.discard(home_id)
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        started = time.monotonic()
+        deadline = started + REFRESH_DEADLINE_SECONDS
+        previous_homes = (self.data or {}).get("homes", {}) or {}
+        try:
+            async with asyncio.timeout(min(TOKEN_BUDGET_SECONDS, self._required_budget(deadline, 1))):
+                await self.api.async_ensure_token()
+            # homesdata + (best guess) one homestatus per known home
+            async with asyncio.timeout(self._required_budget(deadline, 1 + len(previous_homes))):
+                homesdata = await self.api.async_get_homesdata()
             self.last_http_status = self.api.last_http_status
 
-            homes = homesdata.get("body", {}).get("homes", []) or []
+            if self.statistics is not None and self._backfill_marks is None:
+                stored = await self._backfill_store.async_load() or {}
+                self._backfill_marks = stored.get("homes", {})
+                self._backfill_gaps = {home_id: list(gaps) for home_id, gaps in stored.get("gaps", {}).items()}
+
+            all_homes = homesdata.get("body", {}).get("homes", []) or []
+            homes: list[dict[str, Any]] = []
+            pruned_homes: list[str] = []
+            self.known_homes = {
+                str(home.get("id")): home.get("name", f"home_{home.get('id')}") for home in all_homes
+            }
+            for home in all_homes:
+                if self._should_fetch_home(str(home.get("id"))):
+                    homes.append(home)
+                else:
+                    pruned_homes.append(str(home.get("id")))
+            self.pruned_homes = pruned_homes
             combined: dict[str, Any] = {"homes": {}}
+            cut_homes: list[str] = []
+            failed_homes: dict[str, str] = {}
+            throttled: VeluxKixRateLimitError | None = None
 
-            for home in homes:
+            for idx, home in enumerate(homes):
                 home_id = str(home.get("id"))
-                homestatus = await self.api.async_get_homestatus(home_id)
-                self.last_http_status = self.api.last_http_status
+                budget = self._request_budget(deadline, len(homes) - idx)
+                if throttled is not None:
+                    # Do not keep hammering the cloud once it asked us to slow down
+                    failed_homes[home_id] = "Skipped while rate limited"
+                elif budget is None:
+                    cut_homes.append(home_id)
+                else:
+                    try:
+                        async with asyncio.timeout(budget):
+                            homestatus = await self.api.async_get_homestatus(home_id)
+                    except TimeoutError:
+                        # Our deadline fired (the client's own timeout raises RuntimeError)
+                        cut_homes.append(home_id)
+                    except VeluxKixRateLimitError as err:
+                        self.last_http_status = self.api.last_http_status
+                        failed_homes[home_id] = str(err)
+                        throttled = err
+                    except Exception as err:
+                        self.last_http_status = self.api.last_http_status
+                        failed_homes[home_id] = str(err)
+                    else:
+                        self.last_http_status = self.api.last_http_status
+                        combined["homes"][home_id] = {
+                            "meta": home,
+                            "status": homestatus.get("body", {}).get("home", {}),
+                        }
+                        self.home_last_success_ts[home_id] = time.time()
+                        self.cadence.observe_home(home_id, combined["homes"][home_id]["status"])
+                        if self.statistics is not None:
+                            self.statistics.add_home(
+                                home_id, home, combined["homes"][home_id]["status"], dt_util.utcnow()
+                            )
+                            self._note_home_sampled(home_id, home, combined["homes"][home_id]["status"])
+                        continue
+
+                # Cut off or failed: keep serving the last good status for this home
+                if home_id in previous_homes:
+                    combined["homes"][home_id] = {**previous_homes[home_id], "meta": home}
 
-                combined["homes"][home_id] = {
-                    "meta": home,
-                    "status": homestatus.get("body", {}).get("home", {}),
-                }
+            self.deadline_cut_homes = cut_homes
+            self.home_errors = failed_homes
+            if cut_homes:
+                self.logger.warning(
+                    "Refresh deadline of %ss reached, skipped homestatus for homes: %s",
+                    REFRESH_DEADLINE_SECONDS,
+                    ", ".join(cut_homes),
+                )
+            for home_id, error in failed_homes.items():
+                self.logger.warning("Fetching homestatus for home %s failed: %s", home_id, error)
+
+            if self.statistics is not None:
+                self._flush_statistics()
+
+            if throttled is not None:
+                self._record_throttled(throttled)
+            else:
+                self.poll_interval.record_success()
+                self._schedule_next_poll()
+
+            # Only a refresh where no home could be fetched counts as failed
+            if homes and len(cut_homes) + len(failed_homes) == len(homes):
+                raise UpdateFailed(f"No home could be refreshed ({len(homes)} homes)")
 
             self.last_success_ts = time.time()
             return combined
 
+        except UpdateFailed:
+            raise
+        except VeluxKixRateLimitError as err:
+            self.last_http_status = self.api.last_http_status
+            self._record_throttled(err)
+            raise UpdateFailed(f"Rate limited by the Velux cloud: {err}") from err
+        except TimeoutError as err:
+            self.last_http_status = self.api.last_http_status
+            # Token or homesdata ran out of time: no home was refreshed
+            self.deadline_cut_homes = [
+                home_id for home_id in (self.known_homes or previous_homes) if home_id not in self.pruned_homes
+            ]
+            raise UpdateFailed(f"Refresh deadline of {REFRESH_DEADLINE_SECONDS}s exceeded") from err
         except Exception as err:
             # keep last_http_status as "last request overall"
             self.last_http_status = self.api.last_http_status
             raise UpdateFailed(str(err)) from err
+        finally:
+            self.last_refresh_duration = round(time.monotonic() - started, 3)
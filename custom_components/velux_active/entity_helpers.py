@@ -1,31 +1,36 @@
 from __future__ import annotations
 
-import time
 from typing import Any
 
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, FAIL_UNAVAILABLE_AFTER_SECONDS
+from .const import DOMAIN
 from .coordinator import VeluxKixDataUpdateCoordinator
 
 
+# Keys whose entities stay available while their module/room is stale: they explain why
+STALENESS_EXEMPT_KEYS = ("last_seen", "battery", "battery_percent")
+
+
 class VeluxKixBaseEntity(CoordinatorEntity[VeluxKixDataUpdateCoordinator]):
+    # Entities bound to a home judge availability by that home's freshness
+    _home_id: str | None = None
+    # ("module" | "room", id) whose staleness makes this entity unavailable; None for
+    # entities that report or explain staleness themselves (last seen, reachable, battery)
+    _stale_key: tuple[str, str] | None = None
+
     def __init__(self, coordinator: VeluxKixDataUpdateCoordinator) -> None:
         super().__init__(coordinator)
 
     @property
     def available(self) -> bool:
-        # If we never had a successful update, mark unavailable.
-        if self.coordinator.last_success_ts is None:
-            return False
-
-        # If updates fail continuously for > 1 hour, mark unavailable.
-        if not self.coordinator.last_update_success:
-            if (time.time() - self.coordinator.last_success_ts) > FAIL_UNAVAILABLE_AFTER_SECONDS:
-                return False
-
-        return True
+        # Precomputed by the coordinator once per refresh
+        if self._home_id is None:
+            return self.coordinator.api_available
+        if self._stale_key is None:
+            return self.coordinator.is_available(self._home_id)
+        return self.coordinator.is_available(self._home_id, *self._stale_key)
 
     def _get_home(self, home_id: str) -> dict[str, Any] | None:
         return (self.coordinator.data or {}).get("homes", {}).get(str(home_id))
@@ -35,6 +40,15 @@ class VeluxKixBaseEntity(CoordinatorEntity[VeluxKixDataUpdateCoordinator]):
         return 1 if bool(value) else 0
 
 
+def api_device_info() -> DeviceInfo:
+    return DeviceInfo(
+        identifiers={(DOMAIN, "api")},
+        name="Velux API",
+        manufacturer="Velux",
+        model="Cloud API",
+    )
+
+
 def gateway_device_info(home_id: str, home_name: str, gateway_id: str, model: str | None = None) -> DeviceInfo:
     return DeviceInfo(
         identifiers={(DOMAIN, f"{home_id}_gateway_{gateway_id}")},
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from statistics import median
+from typing import Any
+
+from .api import coerce_timestamp
+from .const import (
+    CADENCE_GRACE_SECONDS,
+    CADENCE_MAX_PERIOD_SECONDS,
+    CADENCE_MAX_SAMPLES,
+    CADENCE_MIN_PERIOD_SECONDS,
+    CADENCE_MIN_SAMPLES,
+    CADENCE_WINDOW,
+    DEFAULT_UPDATE_INTERVAL_SECONDS,
+    MAX_UPDATE_INTERVAL_SECONDS,
+    THROTTLE_BACKOFF_FACTOR,
+    THROTTLE_RECOVERY_FACTOR,
+)
+
+
+class AdaptivePollInterval:
+    """Polling interval that backs off while the cloud throttles us and recovers afterwards.
+
+    Every throttled refresh multiplies the interval (at least up to the cloud's Retry-After);
+    every clean refresh afterwards shrinks it again until it is back at the base interval.
+    """
+
+    def __init__(
+        self,
+        base: float = DEFAULT_UPDATE_INTERVAL_SECONDS,
+        maximum: float = MAX_UPDATE_INTERVAL_SECONDS,
+    ) -> None:
+        self.base = float(base)
+        self.maximum = float(maximum)
+        self.interval = self.base
+        self.consecutive_throttles = 0
+        self.throttled_until: float | None = None  # epoch seconds
+
+    @property
+    def throttled(self) -> bool:
+        return self.interval > self.base
+
+    def record_throttled(self, retry_after: float | None = None) -> float:
+        self.consecutive_throttles += 1
+        interval = self.interval * THROTTLE_BACKOFF_FACTOR
+        if retry_after is not None:
+            interval = max(interval, retry_after)
+            self.throttled_until = time.time() + retry_after
+        self.interval = min(self.maximum, max(self.base, interval))
+        return self.interval
+
+    def record_success(self) -> float:
+        self.consecutive_throttles = 0
+        if self.throttled_until is not None and time.time() >= self.throttled_until:
+            self.throttled_until = None
+        self.interval = max(self.base, self.interval * THROTTLE_RECOVERY_FACTOR)
+        return self.interval
+
+
+class ReportCadenceTracker:
+    """Learns when modules report to the cloud, from successive last_seen values.
+
+    Each module's period is the median of the gaps between distinct last_seen values and
+    its phase is the latest last_seen. The next poll is placed just after the expected
+    report nearest to the regular poll time (inside a window around the interval). The
+    accumulated deviation from the interval is fed back into the target, so the long-run
+    average delay stays at the interval: polls land on fresh data without extra requests.
+    """
+
+    def __init__(self) -> None:
+        # (home_id, module_id) -> {"last": last_seen, "gaps": recent gaps between reports}
+        self._modules: dict[tuple[str, str], dict[str, Any]] = {}
+        # Sum of (chosen delay - interval) over all phase-locked polls so far
+        self._drift = 0.0
+
+    def prune(self, homes: set[str], stale: set[tuple[str, str, str]]) -> None:
+        """Forget modules of homes no longer fetched and stale modules (their last_seen is frozen)."""
+        for key in list(self._modules):
+            home_id, module_id = key
+            if home_id not in homes or (home_id, "module", module_id) in stale:
+                del self._modules[key]
+
+    def observe_home(self, home_id: str, status: dict[str, Any]) -> None:
+        for module in status.get("modules") or []:
+            if module.get("id") is None:
+                continue
+            seen = coerce_timestamp(module.get("last_seen"))
+            if seen is None:
+                continue
+            key = (str(home_id), str(module.get("id")))
+            cadence = self._modules.get(key)
+            if cadence is None:
+                self._modules[key] = {"last": seen, "gaps": deque(maxlen=CADENCE_MAX_SAMPLES)}
+                continue
+            gap = seen - cadence["last"]
+            if gap <= 0:
+                continue
+            if CADENCE_MIN_PERIOD_SECONDS <= gap <= CADENCE_MAX_PERIOD_SECONDS:
+                cadence["gaps"].append(gap)
+            cadence["last"] = seen
+
+    @staticmethod
+    def _period(cadence: dict[str, Any]) -> float | None:
+        if len(cadence["gaps"]) < CADENCE_MIN_SAMPLES:
+            return None
+        return median(cadence["gaps"])
+
+    def home_periods(self) -> dict[str, float]:
+        """Median learned reporting period per home (seconds), for diagnostics."""
+        periods: dict[str, list[float]] = {}
+        for (home_id, _module_id), cadence in self._modules.items():
+            period = self._period(cadence)
+            if period is not None:
+                periods.setdefault(home_id, []).append(period)
+        return {home_id: round(median(values), 1) for home_id, values in periods.items()}
+
+    def next_poll_delay(self, now: float, interval: float) -> float | None:
+        """Delay until just after the expected report nearest to the drift-corrected poll time."""
+        earliest = now + interval * (1 - CADENCE_WINDOW)
+        latest = now + interval * (1 + CADENCE_WINDOW)
+        target = min(latest, max(earliest, now + interval - self._drift))
+        best: float | None = None
+        for cadence in self._modules.values():
+            period = self._period(cadence)
+            if period is None:
+                continue
+            # The expected reports (plus grace) just before and just after the target
+            before = cadence["last"] + math.floor((target - CADENCE_GRACE_SECONDS - cadence["last"]) / period) * period
+            for expected in (before + CADENCE_GRACE_SECONDS, before + period + CADENCE_GRACE_SECONDS):
+                if expected <= cadence["last"] or not earliest <= expected <= latest:
+                    continue
+                if best is None or abs(expected - target) < abs(best - target):
+                    best = expected
+        if best is None:
+            return None
+        delay = best - now
+        if abs(self._drift + delay - interval) > interval * CADENCE_WINDOW:
+            # Locking on would let the average drift off the interval: pay the drift back first
+            delay = target - now
+        self._drift += delay - interval
+        return delay
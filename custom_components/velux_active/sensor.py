@@ -5,12 +5,21 @@ from typing import Any
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
+from .api import coerce_timestamp
 from .const import DOMAIN
 from .coordinator import VeluxKixDataUpdateCoordinator
-from .entity_helpers import VeluxKixBaseEntity, gateway_device_info, module_device_info, room_device_info
+from .entity_helpers import (
+    STALENESS_EXEMPT_KEYS,
+    VeluxKixBaseEntity,
+    api_device_info,
+    gateway_device_info,
+    module_device_info,
+    room_device_info,
+)
 
 
 async def async_setup_entry(
@@ -19,7 +28,11 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: VeluxKixDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[SensorEntity] = []
+    entities: list[SensorEntity] = [VeluxKixPollIntervalSensor(coordinator)]
+
+    # With statistics import on, climate readings may live only in long-term statistics;
+    # the registry entries were already disabled by the coordinator (async_sync_registry_entries)
+    climate_entities = coordinator.climate_entities
 
     data = coordinator.data or {}
     for home_id, h in (data.get("homes", {}) or {}).items():
@@ -53,6 +66,17 @@ async def async_setup_entry(
                 ]
             )
 
+        # Home-wide aggregates over all rooms
+        if rooms_meta:
+            entities.extend(
+                [
+                    VeluxKixHomeAggregateSensor(coordinator, home_id, home_name, gateway_id, "max_co2", "Max CO2", unit="ppm"),
+                    VeluxKixHomeAggregateSensor(coordinator, home_id, home_name, gateway_id, "min_temperature", "Min Temperature", unit="°C"),
+                    VeluxKixHomeAggregateSensor(coordinator, home_id, home_name, gateway_id, "mean_humidity", "Mean Humidity", unit="%"),
+                    VeluxKixHomeAggregateSensor(coordinator, home_id, home_name, gateway_id, "poor_air_quality_rooms", "Poor Air Quality Rooms"),
+                ]
+            )
+
         # Room sensors
         for room in rooms_meta:
             rid = str(room.get("id"))
@@ -62,14 +86,19 @@ async def async_setup_entry(
             # Only create sensors that exist in room status
             if "air_quality" in rstat:
                 room_entities.append(VeluxKixRoomAirQualitySensor(coordinator, home_id, home_name, rid, rname, gateway_id))
+            climate_sensors: list[SensorEntity] = []
             if "co2" in rstat:
-                room_entities.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "co2", "CO2", unit="ppm"))
+                climate_sensors.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "co2", "CO2", unit="ppm"))
             if "humidity" in rstat:
-                room_entities.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "humidity", "Humidity", unit="%"))
+                climate_sensors.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "humidity", "Humidity", unit="%"))
             if "lux" in rstat:
-                room_entities.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "lux", "Lux", unit="lx"))
+                climate_sensors.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "lux", "Lux", unit="lx"))
             if "temperature" in rstat:
-                room_entities.append(VeluxKixRoomTemperatureSensor(coordinator, home_id, home_name, rid, rname, gateway_id))
+                climate_sensors.append(VeluxKixRoomTemperatureSensor(coordinator, home_id, home_name, rid, rname, gateway_id))
+            for sensor in climate_sensors:
+                # Registered disabled (by the integration) while readings are kept as statistics only
+                sensor._attr_entity_registry_enabled_default = climate_entities
+            room_entities.extend(climate_sensors)
             if "battery_percent" in rstat:
                 room_entities.append(VeluxKixRoomSensor(coordinator, home_id, home_name, rid, rname, gateway_id, "battery_percent", "Battery", unit="%"))
             elif "battery" in rstat:
@@ -175,6 +204,46 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
+class VeluxKixPollIntervalSensor(VeluxKixBaseEntity, SensorEntity):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-sync"
+    _attr_name = "Velux Active KIX 300 Polling Interval"
+    _attr_device_info = api_device_info()
+
+    def __init__(self, coordinator: VeluxKixDataUpdateCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.entry.entry_id}_poll_interval"
+
+    @property
+    def available(self) -> bool:
+        # The effective interval is known even (especially) while the cloud is throttling us
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        if self.coordinator.update_interval is None:
+            return None
+        return int(self.coordinator.update_interval.total_seconds())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        controller = self.coordinator.poll_interval
+        return {
+            "base_interval": int(controller.base),
+            "throttled": controller.throttled,
+            "consecutive_throttles": controller.consecutive_throttles,
+            "throttled_until": (
+                dt_util.utc_from_timestamp(controller.throttled_until).isoformat()
+                if controller.throttled_until is not None
+                else None
+            ),
+            "last_rate_limit": self.coordinator.last_rate_limit,
+            "report_periods": self.coordinator.cadence.home_periods(),
+        }
+
+
 class VeluxKixGatewaySensor(VeluxKixBaseEntity, SensorEntity):
     def __init__(
         self,
@@ -196,6 +265,8 @@ class VeluxKixGatewaySensor(VeluxKixBaseEntity, SensorEntity):
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
         self._attr_device_info = gateway_device_info(self._home_id, home_name, self._gateway_id)
+        if key not in STALENESS_EXEMPT_KEYS:
+            self._stale_key = ("module", self._gateway_id)
         if key == "last_seen":
             self._attr_icon = "mdi:clock-check"
         elif key == "wifi_strength":
@@ -212,12 +283,53 @@ class VeluxKixGatewaySensor(VeluxKixBaseEntity, SensorEntity):
             return None
         val = gw.get(self._key)
         if self._attr_device_class == SensorDeviceClass.TIMESTAMP:
-            ts = _coerce_timestamp(val)
+            ts = coerce_timestamp(val)
             return dt_util.utc_from_timestamp(ts) if ts is not None else None
         # Timestamps are epoch seconds in the API (based on your Ruby usage)
         return float(val) if isinstance(val, (int, float, str)) and str(val).strip() != "" else val
 
 
+class VeluxKixHomeAggregateSensor(VeluxKixBaseEntity, SensorEntity):
+    def __init__(
+        self,
+        coordinator,
+        home_id: str,
+        home_name: str,
+        gateway_id: str | None,
+        key: str,
+        label: str,
+        unit: str | None = None,
+    ) -> None:
+        super().__init__(coordinator)
+        self._home_id = str(home_id)
+        self._key = key
+        self._attr_name = f"Velux {home_name} {label}"
+        self._attr_unique_id = f"{DOMAIN}_{self._home_id}_home_{key}"
+        self._attr_native_unit_of_measurement = unit
+        if gateway_id is not None:
+            self._attr_device_info = gateway_device_info(self._home_id, home_name, gateway_id)
+        if key == "max_co2":
+            self._attr_icon = "mdi:molecule-co2"
+        elif key == "min_temperature":
+            self._attr_icon = "mdi:thermometer-low"
+        elif key == "mean_humidity":
+            self._attr_icon = "mdi:water-percent"
+        elif key == "poor_air_quality_rooms":
+            self._attr_icon = "mdi:air-filter"
+
+    def _aggregate(self) -> dict[str, Any]:
+        return self.coordinator.home_aggregates.get(self._home_id, {}).get(self._key) or {}
+
+    @property
+    def native_value(self) -> Any:
+        return self._aggregate().get("value")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        # "room" for min/max (the room that produced the value), "rooms" for mean/count
+        return {k: v for k, v in self._aggregate().items() if k != "value"}
+
+
 class VeluxKixRoomSensor(VeluxKixBaseEntity, SensorEntity):
     def __init__(
         self,
@@ -239,6 +351,8 @@ class VeluxKixRoomSensor(VeluxKixBaseEntity, SensorEntity):
         self._attr_unique_id = f"{DOMAIN}_{self._home_id}_room_{self._room_id}_{key}"
         self._attr_native_unit_of_measurement = unit
         self._attr_device_info = room_device_info(self._home_id, home_name, self._room_id, room_name, gateway_id)
+        if key not in STALENESS_EXEMPT_KEYS:
+            self._stale_key = ("room", self._room_id)
         if key == "air_quality":
             self._attr_icon = "mdi:air-filter"
         elif key == "co2":
@@ -345,6 +459,8 @@ class VeluxKixModuleSensor(VeluxKixBaseEntity, SensorEntity):
                 model=device_model,
             )
         self._attr_unique_id = f"{DOMAIN}_{self._home_id}_module_{self._module_id}_{key}"
+        if key not in STALENESS_EXEMPT_KEYS:
+            self._stale_key = ("module", self._module_id)
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
         if key == "current_position":
@@ -367,21 +483,7 @@ class VeluxKixModuleSensor(VeluxKixBaseEntity, SensorEntity):
             return None
         val = m.get(self._key)
         if self._attr_device_class == SensorDeviceClass.TIMESTAMP:
-            ts = _coerce_timestamp(val)
+            ts = coerce_timestamp(val)
             return dt_util.utc_from_timestamp(ts) if ts is not None else None
         return float(val) if isinstance(val, (int, float, str)) and str(val).strip() != "" else val
 
-
-def _coerce_timestamp(value: Any) -> float | None:
-    if value is None:
-        return None
-    if isinstance(value, str) and value.strip() == "":
-        return None
-    try:
-        ts = float(value)
-    except (TypeError, ValueError):
-        return None
-    # Heuristic: treat large values as milliseconds
-    if ts >= 1_000_000_000_000:
-        ts = ts / 1000.0
-    return ts
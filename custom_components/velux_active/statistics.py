@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api import VeluxKixApiClient
+from .const import BACKFILL_BATCH_LIMIT, BACKFILL_MAX_WINDOW_SECONDS, BACKFILL_MIN_GAP_SECONDS, DOMAIN
+
+# Room reading key -> (label, unit, scale applied to the raw API value)
+STATISTIC_KEYS: dict[str, tuple[str, str, float]] = {
+    "temperature": ("Temperature", "°C", 0.1),  # API reports tenths of a degree
+    "humidity": ("Humidity", "%", 1.0),
+    "co2": ("CO2", "ppm", 1.0),
+    "lux": ("Lux", "lx", 1.0),
+}
+
+
+def statistic_id(home_id: str, room_id: str, key: str) -> str:
+    """External statistic id (`domain:object_id`, object_id limited to [a-z0-9_])."""
+    object_id = re.sub(r"[^a-z0-9_]", "_", f"{home_id}_{room_id}_{key}".lower())
+    return f"{DOMAIN}:{object_id}"
+
+
+def _statistic_name(home_name: str, room_name: str, label: str) -> str:
+    # Same naming as the room sensor entities
+    return f"Velux {home_name} {room_name} Sensor {label}"
+
+
+def _hour_start(when: datetime) -> datetime:
+    return dt_util.as_utc(when).replace(minute=0, second=0, microsecond=0)
+
+
+class HourlyStatisticsBuffer:
+    """Aggregates room readings into hourly mean/min/max buckets until the hour is complete.
+
+    Completed hours are written in one bulk call per statistic through the recorder's
+    external statistics API; the bucket of the running hour stays in memory.
+    """
+
+    def __init__(self) -> None:
+        # statistic_id -> hour start -> [sum, count, min, max]
+        self._buckets: dict[str, dict[datetime, list[float]]] = {}
+        self._names: dict[str, tuple[str, str]] = {}  # statistic_id -> (name, unit)
+
+    def add_sample(self, stat_id: str, name: str, unit: str, value: float, when: datetime) -> None:
+        self._names[stat_id] = (name, unit)
+        hours = self._buckets.setdefault(stat_id, {})
+        start = _hour_start(when)
+        bucket = hours.get(start)
+        if bucket is None:
+            hours[start] = [value, 1, value, value]
+            return
+        bucket[0] += value
+        bucket[1] += 1
+        bucket[2] = min(bucket[2], value)
+        bucket[3] = max(bucket[3], value)
+
+    def add_home(self, home_id: str, meta: dict[str, Any], status: dict[str, Any], when: datetime) -> None:
+        home_name = meta.get("name", f"home_{home_id}")
+        room_names = {str(r.get("id")): r.get("name", str(r.get("id"))) for r in (meta.get("rooms") or [])}
+        for room in status.get("rooms") or []:
+            if room.get("id") is None:
+                continue
+            room_id = str(room.get("id"))
+            for key, (label, unit, scale) in STATISTIC_KEYS.items():
+                raw = room.get(key)
+                try:
+                    value = float(raw) * scale
+                except (TypeError, ValueError):
+                    continue
+                self.add_sample(
+                    statistic_id(home_id, room_id, key),
+                    _statistic_name(home_name, room_names.get(room_id, room_id), label),
+                    unit,
+                    value,
+                    when,
+                )
+
+    def pop_completed(self, now: datetime) -> dict[str, list[tuple[datetime, float, float, float]]]:
+        """Remove and return all buckets of hours that have ended: (start, mean, min, max)."""
+        current = _hour_start(now)
+        completed: dict[str, list[tuple[datetime, float, float, float]]] = {}
+        for stat_id, hours in self._buckets.items():
+            done = sorted(start for start in hours if start < current)
+            for start in done:
+                total, count, low, high = hours.pop(start)
+                completed.setdefault(stat_id, []).append((start, total / count, low, high))
+        return completed
+
+    def async_flush(self, hass: HomeAssistant, now: datetime) -> int:
+        """Write all completed hours; returns the number of hourly rows handed to the recorder."""
+        completed = self.pop_completed(now)
+        if not completed:
+            return 0
+        rows = 0
+        for stat_id, hours in completed.items():
+            name, unit = self._names[stat_id]
+            async_write_statistics(hass, stat_id, name, unit, hours)
+            rows += len(hours)
+        return rows
+
+
+def async_write_statistics(
+    hass: HomeAssistant,
+    stat_id: str,
+    name: str,
+    unit: str,
+    hours: list[tuple[datetime, float, float | None, float | None]],
+) -> None:
+    """Bulk-write hourly (start, mean, min, max) rows for one external statistic; min/max may be None."""
+    # Imported lazily: the recorder is only needed when statistics import is enabled.
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=name,
+        source=DOMAIN,
+        statistic_id=stat_id,
+        unit_of_measurement=unit,
+    )
+    rows: list[StatisticData] = []
+    for start, mean, low, high in hours:
+        row = StatisticData(start=start, mean=mean)
+        if low is not None:
+            row["min"] = low
+        if high is not None:
+            row["max"] = high
+        rows.append(row)
+    async_add_external_statistics(hass, metadata, rows)
+
+
+def parse_measure_rows(payload: dict[str, Any]) -> list[tuple[float, float]]:
+    """(timestamp, raw value) rows from a measure response, in either of the cloud's formats."""
+    body = payload.get("body")
+    rows: list[tuple[float, float]] = []
+    if isinstance(body, dict):
+        # optimize=false: {"<epoch>": [value], ...}
+        for ts, values in body.items():
+            try:
+                rows.append((float(ts), float(values[0])))
+            except (TypeError, ValueError, IndexError):
+                continue
+    elif isinstance(body, list):
+        # optimize=true: [{"beg_time": t0, "step_time": dt, "value": [[v], [v], ...]}, ...]
+        for chunk in body:
+            beg = float(chunk.get("beg_time") or 0)
+            step = float(chunk.get("step_time") or 0)
+            for idx, values in enumerate(chunk.get("value") or []):
+                try:
+                    rows.append((beg + idx * step, float(values[0])))
+                except (TypeError, ValueError, IndexError):
+                    continue
+    rows.sort()
+    return rows
+
+
+def backfill_window(mark: float, now: float, live_covered: bool) -> tuple[float, float] | None:
+    """Window [begin, end) to backfill for a home whose statistics are covered up to `mark`, if any.
+
+    While the live buffer kept sampling in this run, only gaps longer than BACKFILL_MIN_GAP_SECONDS
+    are backfilled, from the next full hour (the hour of `mark` was written with min/max). The
+    first sample after a restart backfills whenever an hour has ended since `mark`: the running
+    hour was only kept in memory and is backfilled from its start. Never further back than
+    BACKFILL_MAX_WINDOW_SECONDS.
+    """
+    hour = mark - mark % 3600
+    if live_covered:
+        if now - mark <= BACKFILL_MIN_GAP_SECONDS:
+            return None
+        hour += 3600
+    begin = max(hour, now - BACKFILL_MAX_WINDOW_SECONDS)
+    if begin >= now - now % 3600:
+        return None
+    return begin, now
+
+
+async def async_backfill_home(
+    hass: HomeAssistant,
+    api: VeluxKixApiClient,
+    home_id: str,
+    meta: dict[str, Any],
+    status: dict[str, Any],
+    begin: float,
+    end: float,
+) -> int:
+    """Fill hourly statistics of every room reading for [begin, end) from the cloud's history.
+
+    One paged request per room and key (up to BACKFILL_BATCH_LIMIT hourly rows each), written
+    with one bulk call per statistic. The running hour is left to the live buffer.
+    Returns the number of hourly rows written.
+    """
+    home_name = meta.get("name", f"home_{home_id}")
+    room_names = {str(r.get("id")): r.get("name", str(r.get("id"))) for r in (meta.get("rooms") or [])}
+    current_hour = _hour_start(dt_util.utc_from_timestamp(end))
+    written = 0
+    for room in status.get("rooms") or []:
+        if room.get("id") is None:
+            continue
+        room_id = str(room.get("id"))
+        for key, (label, unit, scale) in STATISTIC_KEYS.items():
+            if key not in room:
+                continue
+            rows: list[tuple[float, float]] = []
+            cursor = begin
+            while cursor < end:
+                batch = parse_measure_rows(await api.async_get_room_measure(home_id, room_id, key, cursor, end))
+                rows.extend(batch)
+                if len(batch) < BACKFILL_BATCH_LIMIT:
+                    break
+                next_cursor = batch[-1][0] + 1
+                if next_cursor <= cursor:
+                    # A full page that does not move past the cursor would be requested forever
+                    break
+                cursor = next_cursor
+
+            # Measure values use the same raw units as homestatus
+            hours: dict[datetime, list[float]] = {}
+            for ts, raw in rows:
+                start = _hour_start(dt_util.utc_from_timestamp(ts))
+                if start < current_hour:
+                    hours.setdefault(start, []).append(raw * scale)
+            if not hours:
+                continue
+            async_write_statistics(
+                hass,
+                statistic_id(home_id, room_id, key),
+                _statistic_name(home_name, room_names.get(room_id, room_id), label),
+                unit,
+                # Hourly scale: one mean per hour, no min/max from the cloud
+                [(start, sum(values) / len(values), None, None) for start, values in sorted(hours.items())],
+            )
+            written += len(hours)
+    return written
+
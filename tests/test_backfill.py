@@ -0,0 +1,110 @@
+"""Backfill of hourly statistics against a mocked getroommeasure endpoint."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from custom_components.velux_active import statistics
+from custom_components.velux_active.const import (
+    BACKFILL_BATCH_LIMIT,
+    BACKFILL_MAX_WINDOW_SECONDS,
+    BACKFILL_MIN_GAP_SECONDS,
+)
+
+HOUR = 3600
+BEGIN = 1_700_000_000 - 1_700_000_000 % HOUR  # a full UTC hour
+META = {"name": "Home", "rooms": [{"id": "r1", "name": "Living"}]}
+STATUS = {"rooms": [{"id": "r1", "co2": 600}]}
+
+
+class FakeMeasureApi:
+    """Serves canned getroommeasure pages (optimize=false format) and records each request."""
+
+    def __init__(self, pages: list[list[tuple[float, float]]]) -> None:
+        self.pages = list(pages)
+        self.calls: list[tuple[str, str, str, float, float]] = []
+
+    async def async_get_room_measure(self, home_id, room_id, measure_type, date_begin, date_end, **_kwargs):
+        self.calls.append((home_id, room_id, measure_type, date_begin, date_end))
+        rows = self.pages.pop(0) if self.pages else []
+        return {"status": "ok", "body": {str(int(ts)): [value] for ts, value in rows}}
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Capture async_write_statistics calls instead of going to the recorder."""
+    calls: list[tuple[str, list[tuple[datetime, float, float | None, float | None]]]] = []
+
+    def _capture(_hass, stat_id, _name, _unit, hours):
+        calls.append((stat_id, hours))
+
+    monkeypatch.setattr(statistics, "async_write_statistics", _capture)
+    return calls
+
+
+def _run(api: FakeMeasureApi, begin: float, end: float) -> int:
+    return asyncio.run(statistics.async_backfill_home(None, api, "h1", META, STATUS, begin, end))
+
+
+def test_pages_until_short_batch(written) -> None:
+    first = [(BEGIN + idx * HOUR, 500.0) for idx in range(BACKFILL_BATCH_LIMIT)]
+    last_ts = first[-1][0]
+    second = [(last_ts + HOUR, 700.0)]
+    end = last_ts + 3 * HOUR
+    api = FakeMeasureApi([first, second])
+
+    rows = _run(api, BEGIN, end)
+
+    assert [call[3] for call in api.calls] == [BEGIN, last_ts + 1]
+    assert rows == BACKFILL_BATCH_LIMIT + 1
+    stat_id, hours = written[0]
+    assert stat_id == statistics.statistic_id("h1", "r1", "co2")
+    assert hours[-1] == (datetime.fromtimestamp(last_ts + HOUR, timezone.utc), 700.0, None, None)
+
+
+def test_stops_when_cursor_does_not_advance(written) -> None:
+    # A misbehaving endpoint returning a full page that ends before the cursor
+    stuck = [(BEGIN - HOUR, 500.0)] * BACKFILL_BATCH_LIMIT
+    api = FakeMeasureApi([[(BEGIN + idx, 500.0) for idx in range(BACKFILL_BATCH_LIMIT)], stuck, stuck])
+
+    _run(api, BEGIN, BEGIN + 10 * HOUR)
+
+    assert len(api.calls) == 2
+
+
+def test_groups_by_hour_and_skips_running_hour(written) -> None:
+    end = BEGIN + 2 * HOUR + 600  # ten minutes into the third hour
+    api = FakeMeasureApi(
+        [[(BEGIN, 400.0), (BEGIN + 1800, 600.0), (BEGIN + HOUR, 800.0), (BEGIN + 2 * HOUR, 900.0)]]
+    )
+
+    assert _run(api, BEGIN, end) == 2
+    _stat_id, hours = written[0]
+    assert hours == [
+        (datetime.fromtimestamp(BEGIN, timezone.utc), 500.0, None, None),
+        (datetime.fromtimestamp(BEGIN + HOUR, timezone.utc), 800.0, None, None),
+    ]
+
+
+def test_backfill_window_after_outage() -> None:
+    mark = BEGIN + 1200
+    # Live buffer wrote the mark's hour: start at the next full hour
+    assert statistics.backfill_window(mark, BEGIN + 5 * HOUR, True) == (BEGIN + HOUR, BEGIN + 5 * HOUR)
+    # Short polling gaps are covered by the live buffer
+    assert statistics.backfill_window(mark, mark + BACKFILL_MIN_GAP_SECONDS, True) is None
+
+
+def test_backfill_window_after_restart() -> None:
+    # Stopped at 10:50, started at 11:10: the 10:00 hour was never written
+    mark = BEGIN + 50 * 60
+    now = BEGIN + HOUR + 10 * 60
+    assert statistics.backfill_window(mark, now, False) == (BEGIN, now)
+    # Restarted within the same hour: nothing has ended yet
+    assert statistics.backfill_window(mark, BEGIN + 55 * 60, False) is None
+
+
+def test_backfill_window_is_capped() -> None:
+    now = BEGIN + 5 * HOUR
+    assert statistics.backfill_window(BEGIN - 30 * 86400, now, False) == (now - BACKFILL_MAX_WINDOW_SECONDS, now)